@@ -1,12 +1,35 @@
 """CrewAI AMP API client — kickoff and poll for Deep Research responses."""
 
+import functools
 import json
 import os
+import time
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 
-import requests
+import httpx
 import streamlit as st
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
+
+TERMINAL_STATES = frozenset({"SUCCESS", "FAILURE", "TIMEOUT", "ERROR"})
+
+# Poll delay backs off while progress is unchanged and resets when it moves.
+_POLL_MIN_DELAY = 0.5
+_POLL_MAX_DELAY = 5.0
+_POLL_BACKOFF = 1.6
+
+# GETs that hit a gateway error are retried with exponential backoff.
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_RETRIES = 3
+_RETRY_BACKOFF = 0.3
+
+
+@functools.lru_cache(maxsize=None)
 def _get_secret(key: str) -> str | None:
     """Read a secret from st.secrets (local) or os.environ (Heroku)."""
     try:
@@ -15,6 +38,7 @@ def _get_secret(key: str) -> str | None:
         return os.environ.get(key)
 
 
+@functools.lru_cache(maxsize=None)
 def _api_url() -> str:
     url = _get_secret("CRW_API_URL")
     if not url:
@@ -23,43 +47,63 @@ def _api_url() -> str:
     return url.rstrip("/")
 
 
-def _headers() -> dict:
+@functools.lru_cache(maxsize=None)
+def _token() -> str:
     token = _get_secret("CRW_API_TOKEN")
     if not token:
         st.error("CRW_API_TOKEN is not configured. Set it in .streamlit/secrets.toml or as an environment variable.")
         st.stop()
-    return {
-        "Authorization": f"Bearer {token}",
+    return token
+
+
+@functools.lru_cache(maxsize=None)
+def _headers() -> Mapping[str, str]:
+    # Secrets don't change at runtime, so the headers are built once and shared read-only.
+    return MappingProxyType({
+        "Authorization": f"Bearer {_token()}",
         "Content-Type": "application/json",
-    }
+        # SUCCESS payloads carry the full answer and sources, so ask for them compressed.
+        "Accept-Encoding": "gzip, br",
+    })
+
+
+@st.cache_resource
+def _client() -> httpx.Client:
+    """Shared HTTP/2 client so repeated polls reuse one pooled connection."""
+    # Transport-level retries only cover failed connects; gateway errors are retried in api_request.
+    return httpx.Client(transport=httpx.HTTPTransport(http2=True, retries=_RETRIES), timeout=30.0)
 
 
 def api_request(endpoint: str, method: str = "GET", data: dict | None = None) -> dict | None:
     """Make an authenticated request to the CrewAI AMP API."""
+    if method not in ("GET", "POST"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
     url = f"{_api_url()}/{endpoint}"
     try:
-        if method == "GET":
-            resp = requests.get(url, headers=_headers(), timeout=30)
-        elif method == "POST":
-            resp = requests.post(url, headers=_headers(), json=data, timeout=30)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+        for attempt in range(_RETRIES + 1):
+            resp = _client().request(method, url, json=data, headers=_headers())
+            if method != "GET" or resp.status_code not in _RETRY_STATUSES or attempt == _RETRIES:
+                break
+            time.sleep(_RETRY_BACKOFF * 2**attempt)
         resp.raise_for_status()
-        return resp.json()
-    except requests.exceptions.RequestException as e:
+        return _loads(resp.content)
+    except (httpx.HTTPError, json.JSONDecodeError) as e:
         st.error(f"API request failed: {e}")
         return None
 
 
-def kickoff_research(user_message: str, chat_id: str) -> str | None:
-    """Send a message to the Deep Research flow and return the kickoff_id."""
-    payload = {
+def _kickoff_payload(user_message: str, chat_id: str) -> dict:
+    return {
         "inputs": {
             "user_message": user_message,
             "id": chat_id,
         }
     }
-    result = api_request("kickoff", method="POST", data=payload)
+
+
+def kickoff_research(user_message: str, chat_id: str) -> str | None:
+    """Send a message to the Deep Research flow and return the kickoff_id."""
+    result = api_request("kickoff", method="POST", data=_kickoff_payload(user_message, chat_id))
     if result and "kickoff_id" in result:
         return result["kickoff_id"]
     return None
@@ -73,7 +117,53 @@ def poll_status(kickoff_id: str) -> dict:
         result: dict | None — parsed result when state is SUCCESS
         last_executed_task: str | None — description of current progress
     """
-    data = api_request(f"status/{kickoff_id}")
+    return _parse_status(api_request(f"status/{kickoff_id}"))
+
+
+def poll_status_until_done(
+    kickoff_id: str,
+    on_progress: Callable[[str | None], None] | None = None,
+    timeout: float = 300.0,
+) -> dict:
+    """Poll until the kickoff reaches a terminal state or `timeout` seconds pass.
+
+    The delay between polls starts at 0.5s and grows towards 5s while
+    last_executed_task stays the same; a new task resets it and is reported
+    through `on_progress`. Returns the last poll_status dict, whose state is
+    still non-terminal if the timeout was reached.
+    """
+    deadline = time.monotonic() + timeout
+    prev_task = None
+    delay = _POLL_MIN_DELAY
+    # A kickoff is never finished the moment it is accepted, so skip the
+    # round-trip that would only come back PENDING.
+    time.sleep(delay)
+    while True:
+        status = poll_status(kickoff_id)
+        if status["state"] in TERMINAL_STATES:
+            return status
+
+        last_task = status["last_executed_task"]
+        progressed = last_task != prev_task
+        if progressed:
+            prev_task = last_task
+            if on_progress:
+                on_progress(last_task)
+        delay = _next_poll_delay(delay, progressed)
+
+        if time.monotonic() + delay > deadline:
+            return status
+        time.sleep(delay)
+
+
+def _next_poll_delay(delay: float, progressed: bool) -> float:
+    if progressed:
+        return _POLL_MIN_DELAY
+    return min(delay * _POLL_BACKOFF, _POLL_MAX_DELAY)
+
+
+def _parse_status(data: dict | None) -> dict:
+    """Normalize a raw status payload into the dict returned by poll_status."""
     if not data:
         return {"state": "ERROR", "result": None, "last_executed_task": None}
 
@@ -85,7 +175,7 @@ def poll_status(kickoff_id: str) -> dict:
         raw = data["result"]
         if isinstance(raw, str):
             try:
-                parsed_result = json.loads(raw)
+                parsed_result = _loads(raw)
             except json.JSONDecodeError:
                 parsed_result = {"response": raw}
         elif isinstance(raw, dict):
@@ -2,14 +2,13 @@
 
 import base64
 import html
-import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 
 import streamlit as st
 
-from api import extract_response, kickoff_research, poll_status
+from api import TERMINAL_STATES, extract_response, kickoff_research, poll_status_until_done
 
 # ── Page config ─────────────────────────────────────────────
 
@@ -228,17 +227,8 @@ def _handle_crew_response(chat_id: str, prompt: str, status_area) -> str | None:
     if not kickoff_id:
         return None
 
-    max_attempts = 150  # 150 x 2s = 5 minutes
-    for _ in range(max_attempts):
-        status = poll_status(kickoff_id)
-
-        if status["state"] == "SUCCESS" and status["result"]:
-            return extract_response(status["result"])
-
-        if status["state"] in ("FAILURE", "TIMEOUT", "ERROR"):
-            return None
-
-        task_text = html.escape(status.get("last_executed_task") or "Researching...")
+    def _show_progress(last_task: str | None) -> None:
+        task_text = html.escape(last_task or "Researching...")
         status_area.markdown(
             f'<div class="thinking-container">'
             f'<div><span class="thinking-dot"></span>'
@@ -248,7 +238,14 @@ def _handle_crew_response(chat_id: str, prompt: str, status_area) -> str | None:
             f'</div>',
             unsafe_allow_html=True,
         )
-        time.sleep(2)
+
+    status = poll_status_until_done(kickoff_id, on_progress=_show_progress, timeout=300)  # 5 minutes
+
+    if status["state"] == "SUCCESS":
+        return extract_response(status["result"])
+
+    if status["state"] in TERMINAL_STATES:
+        return None
 
     return "__TIMEOUT__"
 
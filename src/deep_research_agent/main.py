@@ -1,11 +1,27 @@
 #!/usr/bin/env python
+import functools
+import logging
+import re
 from datetime import datetime
+from string import Template
 from typing import List, Literal, Optional
 
 from crewai import LLM, Agent
 from crewai.flow import Flow, listen, persist, router, start
-from crewai_tools import FirecrawlScrapeWebsiteTool, FirecrawlSearchTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
+
+from deep_research_agent.persistence import MsgpackFlowPersistence
+from deep_research_agent.tools import (
+    BatchFirecrawlScrapeWebsiteTool,
+    BatchFirecrawlSearchTool,
+)
+
+logger = logging.getLogger(__name__)
+
+# Once history grows past twice SUMMARY_AFTER messages, the oldest
+# SUMMARY_AFTER are folded into a running summary. Prompts see the summary plus
+# every retained message, so together they always cover the whole conversation.
+SUMMARY_AFTER = 6
 
 # ── Data Models ──────────────────────────────────────────────────────────────
 
@@ -13,7 +29,17 @@ from pydantic import BaseModel, Field
 class Message(BaseModel):
     role: Literal["user", "assistant"] = "user"
     content: str
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: Optional[str] = None
+
+    def with_timestamp(self) -> "Message":
+        """Return this message stamped with the current time if it has none.
+
+        Timestamps are never read by the prompts, so they are only filled in
+        where a message is actually displayed.
+        """
+        if self.timestamp:
+            return self
+        return self.model_copy(update={"timestamp": datetime.now().isoformat()})
 
 
 class RouterOutput(BaseModel):
@@ -28,74 +54,189 @@ class FlowState(BaseModel):
         "Hey, do a deep research on the Agentic AI Framework in the market as of 2026"
     )
     message_history: List[Message] = []
+    history_summary: str = ""
     search_queries: Optional[List[str]] = None
     chat_response: Optional[str] = None
     response: Optional[str] = None
 
 
+def format_messages(messages: List[Message]) -> str:
+    """Render messages as `role: content` lines for use in prompts."""
+    return "\n".join(f"{message.role}: {message.content}" for message in messages)
+
+
+# ── Prompts ──────────────────────────────────────────────────────────────────
+# The static instructions come first and the per-message inputs last, so every
+# router call shares the longest possible prefix for provider-side prompt caching.
+
+ROUTER_PROMPT = Template("""
+<task>
+You are the router for a search assistant. Classify the user's message and
+decide whether to search the web or reply conversationally.
+</task>
+
+<routing_rules>
+Return "casual_chat" ONLY when the message is:
+- A pure greeting ("hi", "hello", "hey there")
+- A thank-you or farewell ("thanks!", "bye")
+- A meta-question about this assistant ("what can you do?", "how do you work?")
+- Anything that is not a clear research query
+
+Return "search" for EVERYTHING else, including:
+- Any factual question, no matter how simple
+- Requests for explanations, comparisons, or summaries
+- Vague or broad topics (search anyway — you can refine later)
+- Opinions or recommendations (search for expert perspectives)
+
+Tie-breaking rule: When in doubt, return "casual_chat" and a follow up question to clarify.
+</routing_rules>
+
+<output_instructions>
+If intent is "casual_chat":
+- Set chat_response: a brief, friendly reply. If the user seems to want
+information, nudge them to ask a question so you can search for it.
+
+If intent is "search":
+- Set search_queries: 3-5 concise search queries phrased the way a human
+would type them into a search engine. Cover different angles of the question.
+
+Always set reasoning: one sentence explaining your decision.
+</output_instructions>
+
+<inputs>
+Current message: ${user_message}
+
+Conversation history:
+${message_history}
+</inputs>
+""")
+
+
+# Messages this trivial are always casual_chat, so the router answers them with
+# a canned reply instead of an LLM round-trip. Both routing paths are logged at
+# debug level, so the hit rate can be checked when tuning the pattern.
+TRIVIAL_MESSAGE = re.compile(
+    r"^\s*(?:"
+    r"(?P<greeting>hi+|hello|hey(?: there)?|good\s+(?:morning|afternoon|evening))"
+    r"|(?P<thanks>thanks|thank\s+you)"
+    r"|(?P<farewell>bye|goodbye)"
+    r")[\s!.?]*$",
+    re.IGNORECASE,
+)
+
+CANNED_REPLIES = {
+    "greeting": "Hey! I'm a search assistant. Ask me anything and I'll look it up for you.",
+    "thanks": "You're welcome! Ask me anything else and I'll look it up for you.",
+    "farewell": "Bye! Come back any time you have something to look up.",
+}
+
+
+# ── Shared LLMs and Tools ───────────────────────────────────────────────────
+# None of these hold per-chat state, so they are built once per process and
+# reused across kickoffs instead of re-resolving clients on every message.
+
+
+@functools.cache
+def _router_llm() -> LLM:
+    return LLM(model="gpt-4.1-mini", temperature=0.1, response_format=RouterOutput)
+
+
+@functools.cache
+def _summary_llm() -> LLM:
+    return LLM(model="gpt-4.1-nano", temperature=0)
+
+
+@functools.cache
+def _search_llm() -> LLM:
+    return LLM(model="gpt-4.1-mini", temperature=0.2)
+
+
+@functools.cache
+def _search_tools() -> tuple:
+    return (BatchFirecrawlSearchTool(), BatchFirecrawlScrapeWebsiteTool())
+
+
 # ── Flow ─────────────────────────────────────────────────────────────────────
 
 
-@persist()
+@persist(MsgpackFlowPersistence())
 class DeepResearchFlow(Flow[FlowState]):
     def add_message(self, role: str, content: str):
-        """Add a message to the conversation history."""
-        self.state.message_history.append(Message(role=role, content=content))
-
-    # ── 1. Entry point ───────────────────────────────────────────────────
+        """Add a message to the conversation history.
 
-    @start()
-    def starting_flow(self):
-        self.add_message("user", self.state.user_message)
-        return self.state.user_message
+        Roles and content come from the flow itself, so validation is skipped.
+        """
+        self.state.message_history.append(Message.model_construct(role=role, content=content))
+        if len(self.state.message_history) > SUMMARY_AFTER * 2:
+            self.summarize_history()
 
-    # ── 2. Router — single LLM call for classification + response ────────
+    def summarize_history(self):
+        """Fold the oldest messages into history_summary to keep prompts short.
 
-    @router(starting_flow)
-    def classify_and_respond(self):
-        llm = LLM(model="gpt-4.1-mini", temperature=0.1, response_format=RouterOutput)
+        The summary is optional, so if the call fails or comes back empty the
+        history is left untouched and the next message retries it.
+        """
+        oldest = self.state.message_history[:SUMMARY_AFTER]
+        llm = _summary_llm()
 
         prompt = f"""
         <task>
-        You are the router for a search assistant. Classify the user's message and
-        decide whether to search the web or reply conversationally.
+        Update the running summary of a conversation between a user and a search
+        assistant. Keep the topics the user asked about, key facts from the answers,
+        and anything left open. Reply with the summary only, at most 5 sentences.
         </task>
 
-        <routing_rules>
-        Return "casual_chat" ONLY when the message is:
-        - A pure greeting ("hi", "hello", "hey there")
-        - A thank-you or farewell ("thanks!", "bye")
-        - A meta-question about this assistant ("what can you do?", "how do you work?")
-        - Anything that is not a clear research query
+        <current_summary>
+        {self.state.history_summary or "None yet."}
+        </current_summary>
 
-        Return "search" for EVERYTHING else, including:
-        - Any factual question, no matter how simple
-        - Requests for explanations, comparisons, or summaries
-        - Vague or broad topics (search anyway — you can refine later)
-        - Opinions or recommendations (search for expert perspectives)
+        <new_messages>
+        {format_messages(oldest)}
+        </new_messages>
+        """
 
-        Tie-breaking rule: When in doubt, return "casual_chat" and a follow up question to clarify.
-        </routing_rules>
+        try:
+            summary = llm.call(prompt)
+        except Exception as e:
+            logger.warning("History summary failed, keeping full history: %s", e)
+            return
+        if not summary:
+            return
 
-        <output_instructions>
-        If intent is "casual_chat":
-        - Set chat_response: a brief, friendly reply. If the user seems to want
-        information, nudge them to ask a question so you can search for it.
+        self.state.history_summary = summary
+        self.state.message_history = self.state.message_history[SUMMARY_AFTER:]
 
-        If intent is "search":
-        - Set search_queries: 3-5 concise search queries phrased the way a human
-        would type them into a search engine. Cover different angles of the question.
+    def history_context(self) -> str:
+        """Conversation context for prompts: running summary plus retained turns."""
+        recent = format_messages(self.state.message_history)
+        if self.state.history_summary:
+            return f"Summary of earlier conversation: {self.state.history_summary}\n{recent}"
+        return recent
 
-        Always set reasoning: one sentence explaining your decision.
-        </output_instructions>
+    # ── 1. Entry point ───────────────────────────────────────────────────
 
-        <inputs>
-        Current message: {self.state.user_message}
+    @start()
+    def starting_flow(self):
+        self.add_message("user", self.state.user_message)
+        return self.state.user_message
 
-        Conversation history:
-        {self.state.message_history}
-        </inputs>
-        """
+    # ── 2. Router — single LLM call for classification + response ────────
+
+    @router(starting_flow)
+    def classify_and_respond(self):
+        trivial = TRIVIAL_MESSAGE.match(self.state.user_message)
+        if trivial:
+            logger.debug("Router fast path: %s", trivial.lastgroup)
+            self.state.chat_response = CANNED_REPLIES[trivial.lastgroup]
+            return "casual_chat"
+
+        logger.debug("Router LLM call")
+        llm = _router_llm()
+
+        prompt = ROUTER_PROMPT.substitute(
+            user_message=self.state.user_message,
+            message_history=self.history_context(),
+        )
 
         response = llm.call(prompt)
 
@@ -111,10 +252,7 @@ class DeepResearchFlow(Flow[FlowState]):
 
     @listen("casual_chat")
     def present_chat_response(self):
-        response = (
-            self.state.chat_response
-            or "Hey! I'm a search assistant. Ask me anything and I'll look it up for you."
-        )
+        response = self.state.chat_response or CANNED_REPLIES["greeting"]
         self.add_message("assistant", response)
         print(f"Assistant: {response}")
         return response
@@ -138,11 +276,8 @@ class DeepResearchFlow(Flow[FlowState]):
                 "knowledgeable friend, not a research paper. Every factual "
                 "claim gets a numbered citation."
             ),
-            tools=[
-                FirecrawlSearchTool(),
-                FirecrawlScrapeWebsiteTool(),
-            ],
-            llm=LLM(model="gpt-4.1-mini", temperature=0.2),
+            tools=list(_search_tools()),
+            llm=_search_llm(),
             verbose=True,
         )
 
@@ -157,18 +292,18 @@ class DeepResearchFlow(Flow[FlowState]):
         </user_question>
 
         <search_queries>
-        Execute these searches using FirecrawlSearchTool:
+        Run these searches with the batch search tool:
         {self.state.search_queries}
         </search_queries>
 
         <tool_instructions>
         Follow this sequence strictly:
-        1. Search ALL queries above using the search tool first.
+        1. Call the batch search tool exactly ONCE, passing ALL queries above together.
         2. Read the snippets returned by the search results.
         3. Assess: do the snippets contain enough information to answer the question well?
         - If YES → write your answer using the snippet information. Do NOT scrape.
-        - If NO → pick the 1-3 most promising URLs and scrape them with
-            FirecrawlScrapeWebsiteTool for deeper content. Hard cap: never scrape
+        - If NO → pick the 1-3 most promising URLs and pass them together in a single
+            call to the batch scrape tool for deeper content. Hard cap: never scrape
             more than 3 URLs total.
         </tool_instructions>
 
@@ -0,0 +1,112 @@
+"""Compact flow state persistence — msgpack snapshots in SQLite."""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+import msgpack
+from crewai.flow.persistence import SQLiteFlowPersistence
+from pydantic import BaseModel
+
+# Digests are only kept for this many recent flows to bound memory.
+_MAX_TRACKED_FLOWS = 1024
+
+
+class MsgpackFlowPersistence(SQLiteFlowPersistence):
+    """SQLite persistence that stores state as msgpack and skips unchanged writes.
+
+    Snapshots live in their own table next to crewAI's JSON `flow_states`
+    table; flows saved before the switch are still loaded from the JSON rows.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._last_digest: Dict[str, bytes] = {}
+        # Flow methods run in worker threads, so concurrent flows save at once.
+        self._digest_lock = threading.Lock()
+        super().__init__(db_path)
+
+    def init_db(self) -> None:
+        super().init_db()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+            CREATE TABLE IF NOT EXISTS flow_state_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                flow_uuid TEXT NOT NULL,
+                method_name TEXT NOT NULL,
+                timestamp DATETIME NOT NULL,
+                state BLOB NOT NULL
+            )
+            """
+            )
+            conn.execute(
+                """
+            CREATE INDEX IF NOT EXISTS idx_flow_state_snapshots_uuid
+            ON flow_state_snapshots(flow_uuid)
+            """
+            )
+
+    def save_state(
+        self,
+        flow_uuid: str,
+        method_name: str,
+        state_data: Union[Dict[str, Any], BaseModel],
+    ) -> None:
+        if isinstance(state_data, BaseModel):
+            state_dict = state_data.model_dump(mode="json")
+        elif isinstance(state_data, dict):
+            state_dict = state_data
+        else:
+            raise ValueError(
+                f"state_data must be either a Pydantic BaseModel or dict, got {type(state_data)}"
+            )
+
+        packed = msgpack.packb(state_dict, use_bin_type=True)
+        digest = hashlib.blake2b(packed, digest_size=16).digest()
+        with self._digest_lock:
+            if self._last_digest.get(flow_uuid) == digest:
+                return
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+            INSERT INTO flow_state_snapshots (
+                flow_uuid,
+                method_name,
+                timestamp,
+                state
+            ) VALUES (?, ?, ?, ?)
+            """,
+                (
+                    flow_uuid,
+                    method_name,
+                    datetime.now(timezone.utc).isoformat(),
+                    packed,
+                ),
+            )
+
+        with self._digest_lock:
+            self._last_digest.pop(flow_uuid, None)
+            self._last_digest[flow_uuid] = digest
+            if len(self._last_digest) > _MAX_TRACKED_FLOWS:
+                self._last_digest.pop(next(iter(self._last_digest)), None)
+
+    def load_state(self, flow_uuid: str) -> Optional[Dict[str, Any]]:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+            SELECT state
+            FROM flow_state_snapshots
+            WHERE flow_uuid = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+                (flow_uuid,),
+            )
+            row = cursor.fetchone()
+
+        if row:
+            return msgpack.unpackb(row[0], raw=False)
+        return super().load_state(flow_uuid)
@@ -1 +1,6 @@
+from deep_research_agent.tools.firecrawl_batch import (
+    BatchFirecrawlScrapeWebsiteTool,
+    BatchFirecrawlSearchTool,
+)
 
+__all__ = ["BatchFirecrawlScrapeWebsiteTool", "BatchFirecrawlSearchTool"]
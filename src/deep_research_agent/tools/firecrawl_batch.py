@@ -0,0 +1,140 @@
+"""Batch Firecrawl tools — fan independent searches/scrapes out concurrently."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from crewai_tools import FirecrawlScrapeWebsiteTool, FirecrawlSearchTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+MAX_SCRAPE_URLS = 3
+
+# Follow-up questions in a chat tend to hit the same queries and pages, so
+# responses are reused for a while instead of paying for another HTTP call.
+CACHE_SIZE = 256
+CACHE_TTL = 600.0
+
+_MISSING = object()
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def wrap(self, fn: Callable[[str], Any]) -> Callable[[str], Any]:
+        """Return `fn` memoized through this cache; failures are not cached."""
+
+        def _fetch(key: str) -> Any:
+            value = self.get(key)
+            if value is _MISSING:
+                value = fn(key)
+                self.set(key, value)
+            return value
+
+        return _fetch
+
+
+def _fan_out(fn: Callable[[str], Any], items: List[str]) -> List[Any]:
+    """Call `fn` on every item concurrently, keeping input order.
+
+    A failing item yields {"error": ...} instead of failing the whole batch.
+    """
+
+    def _safe(item: str) -> Any:
+        try:
+            return fn(item)
+        except Exception as e:
+            return {"error": str(e)}
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        return list(pool.map(_safe, items))
+
+
+def _hit_url(hit: Any) -> Optional[str]:
+    """URL of a search hit — a plain web result or a scraped Document."""
+    url = getattr(hit, "url", None)
+    if url is None and getattr(hit, "metadata", None) is not None:
+        url = hit.metadata.url or getattr(hit.metadata, "source_url", None)
+    return url
+
+
+class BatchFirecrawlSearchToolSchema(BaseModel):
+    queries: List[str] = Field(description="Every search query to run, passed together in one call")
+
+
+class BatchFirecrawlSearchTool(FirecrawlSearchTool):
+    name: str = "Firecrawl batch web search tool"
+    description: str = (
+        "Run several web searches concurrently using Firecrawl. Pass all queries in a "
+        "single call; results are grouped per query with duplicate URLs removed."
+    )
+    args_schema: type[BaseModel] = BatchFirecrawlSearchToolSchema
+    _cache: _TTLCache = PrivateAttr(default_factory=_TTLCache)
+
+    def _run(self, queries: List[str]) -> Any:
+        queries = list(dict.fromkeys(queries))
+        responses = _fan_out(self._cache.wrap(super()._run), queries)
+
+        seen_urls = set()
+        results = []
+        for query, response in zip(queries, responses):
+            if isinstance(response, dict):
+                results.append({"query": query, **response})
+                continue
+            hits = []
+            for hit in getattr(response, "web", None) or []:
+                url = _hit_url(hit)
+                if url in seen_urls:
+                    continue
+                if url:
+                    seen_urls.add(url)
+                hits.append(hit)
+            results.append({"query": query, "results": hits})
+        return results
+
+
+class BatchFirecrawlScrapeWebsiteToolSchema(BaseModel):
+    urls: List[str] = Field(description=f"Up to {MAX_SCRAPE_URLS} URLs to scrape, passed together in one call")
+
+
+class BatchFirecrawlScrapeWebsiteTool(FirecrawlScrapeWebsiteTool):
+    name: str = "Firecrawl batch web scrape tool"
+    description: str = (
+        f"Scrape up to {MAX_SCRAPE_URLS} webpages concurrently using Firecrawl. "
+        "Pass all URLs in a single call; returns the contents of each page."
+    )
+    args_schema: type[BaseModel] = BatchFirecrawlScrapeWebsiteToolSchema
+    _cache: _TTLCache = PrivateAttr(default_factory=_TTLCache)
+
+    def _run(self, urls: List[str]) -> Any:
+        urls = list(dict.fromkeys(urls))[:MAX_SCRAPE_URLS]
+        pages = _fan_out(self._cache.wrap(super()._run), urls)
+        return [{"url": url, "content": page} for url, page in zip(urls, pages)]